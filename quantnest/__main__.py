@@ -0,0 +1,7 @@
+"""python -m quantnest - same as the quantnest console script."""
+
+import sys
+
+from quantnest.cli import main
+
+sys.exit(main())
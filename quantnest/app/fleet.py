@@ -0,0 +1,150 @@
+"""Fleet analytics - screen many portfolios against one price snapshot.
+
+Positions and cash are packed once into integer matrices (exact fixed-point,
+no floats), so values, allocations and health breaches for the whole fleet
+are a handful of NumPy operations instead of one Decimal loop per portfolio.
+Results match Portfolio.allocations() / health_signals() exactly."""
+
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from quantnest.domain.fixedpoint import pack_book, round_half_up, unpack
+from quantnest.domain.market import MarketProvider, Timestamp
+from quantnest.domain.portfolio import Portfolio
+from quantnest.domain.rebalance import Order, plan_rebalance
+
+# Money and allocations are both 2 decimal places (see portfolio._money)
+MONEY_PLACES = 2
+
+
+def _ratio_half_up(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den as hundredths, rounded half up (den must be > 0)."""
+    return (200 * num + den) // (2 * den)
+
+
+class Fleet:
+    """Read-only snapshot of many portfolios priced by one market.
+
+    With `at`, holdings and cash are as they were then (see Portfolio)."""
+
+    def __init__(
+        self,
+        portfolios: Sequence[Portfolio],
+        market: MarketProvider,
+        at: Optional[Timestamp] = None,
+    ):
+        self._portfolios = list(portfolios)
+        positions = [
+            p.positions if at is None else p.positions_at(at) for p in self._portfolios
+        ]
+
+        # One column per symbol held anywhere in the fleet, one price lookup each
+        symbols = dict.fromkeys(s for pos in positions for s in pos)
+        self._market = market
+        self._at = at
+        self._prices: Dict[str, Decimal] = {s: market.get_price(s, at=at) for s in symbols}
+        self._symbols: List[str] = list(self._prices)
+        column = {sym: j for j, sym in enumerate(self._symbols)}
+        self._columns = [[column[s] for s in pos] for pos in positions]
+
+        book = pack_book(
+            positions,
+            self._prices,
+            [p.cash(at=at) for p in self._portfolios],
+            min_price_places=MONEY_PLACES,
+        )
+
+        # Same rounding steps as Portfolio: each position, then the sums
+        self._values = round_half_up(
+            book.quantities * book.prices, book.value_places, MONEY_PLACES
+        )
+        self._cash = round_half_up(book.cash, book.value_places, MONEY_PLACES)
+        self._totals = self._cash + self._values.sum(axis=1)
+
+        funded = self._totals > 0
+        den = np.where(funded, self._totals, 1)
+        self._funded = funded
+        self._cash_alloc = np.where(funded, _ratio_half_up(self._cash, den), 0)
+        self._asset_alloc = np.where(
+            funded[:, None], _ratio_half_up(self._values, den[:, None]), 0
+        )
+
+    @property
+    def symbols(self) -> List[str]:
+        """Column order of the asset matrices."""
+        return self._symbols.copy()
+
+    def __len__(self) -> int:
+        return len(self._portfolios)
+
+    def cash(self) -> np.ndarray:
+        """Cash per portfolio, in paise (1/100 of a rupee)."""
+        return self._cash.copy()
+
+    def asset_values(self) -> np.ndarray:
+        """Market value per portfolio x symbol, in paise."""
+        return self._values.copy()
+
+    def total_values(self) -> np.ndarray:
+        """Cash + asset value per portfolio, in paise."""
+        return self._totals.copy()
+
+    def allocations(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(cash, asset) allocations in hundredths, like Portfolio.allocations()."""
+        return self._cash_alloc.copy(), self._asset_alloc.copy()
+
+    def breaches(
+        self,
+        max_asset_pct: Decimal = Decimal("0.40"),
+        min_cash_pct: Decimal = Decimal("0.10"),
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(concentration per portfolio x symbol, low cash per portfolio) masks."""
+        # Allocations are whole hundredths, so compare against integer thresholds
+        max_h = int((max_asset_pct * 100).to_integral_value(rounding=ROUND_FLOOR))
+        min_h = int((min_cash_pct * 100).to_integral_value(rounding=ROUND_CEILING))
+        concentrated = self._funded[:, None] & (self._asset_alloc > max_h)
+        low_cash = self._cash_alloc < min_h
+        return concentrated, low_cash
+
+    def health_signals(
+        self,
+        max_asset_pct: Decimal = Decimal("0.40"),
+        min_cash_pct: Decimal = Decimal("0.10"),
+    ) -> List[List[str]]:
+        """Portfolio.health_signals() for every portfolio, in fleet order."""
+        concentrated, low_cash = self.breaches(max_asset_pct, min_cash_pct)
+        flagged = concentrated.any(axis=1) | low_cash
+
+        signals: List[List[str]] = [[] for _ in self._portfolios]
+        for i in np.flatnonzero(flagged):
+            # Walk the portfolio's own position order so messages line up
+            for j in self._columns[i]:
+                if concentrated[i, j]:
+                    pct = unpack(self._asset_alloc[i, j], MONEY_PLACES)
+                    signals[i].append(f"⚠️ High concentration in {self._symbols[j]}: {pct:.1%}")
+            if low_cash[i]:
+                pct = unpack(self._cash_alloc[i], MONEY_PLACES)
+                signals[i].append(f"⚠️ Low cash buffer: {pct:.1%}")
+        return signals
+
+    def rebalance(
+        self,
+        target_weights: Dict[str, Decimal],
+        tolerance: Decimal = Decimal("0.01"),
+        lot_size: Decimal = Decimal("1"),
+    ) -> List[List[Order]]:
+        """Portfolio.rebalance() for every portfolio, planned in one pass."""
+        if self._at is not None:
+            raise ValueError("Cannot rebalance a point-in-time (at=) snapshot")
+        positions = [p.positions for p in self._portfolios]
+        prices = dict(self._prices)
+        for sym in [*(s for pos in positions for s in pos), *target_weights]:
+            if sym not in prices:
+                prices[sym] = self._market.get_price(sym)
+        return plan_rebalance(
+            positions,
+            [p.wallet.balance for p in self._portfolios],
+            prices, target_weights, tolerance, lot_size,
+        )
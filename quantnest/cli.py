@@ -0,0 +1,338 @@
+"""quantnest command line - wallet and portfolio operations.
+
+Startup is kept cheap: only the stdlib is imported here and each command
+imports the domain it needs when it runs. With a daemon running
+(`quantnest daemon`), commands are forwarded over a Unix socket to a process
+that keeps wallets and portfolios warm, so nothing is loaded or replayed.
+Both modes read and write the same event log and trade journal."""
+
+import argparse
+import json
+import os
+import sys
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, TextIO
+
+DEFAULT_SOCKET = os.path.join("data", "quantnest.sock")
+SOCKET_ENV = "QUANTNEST_SOCKET"
+
+
+def _files(wallet_id: str) -> tuple:
+    """The wallet's event log and trade journal."""
+    from quantnest.infra.storage import get_event_file, get_trade_file
+    return get_event_file(wallet_id), get_trade_file(wallet_id)
+
+
+def _disk_state(wallet_id: str) -> tuple:
+    """(mtime, size) of each of the wallet's files - see storage.file_state."""
+    from quantnest.infra.storage import file_state
+    return tuple(file_state(path) for path in _files(wallet_id))
+
+
+class Session:
+    """Wallets and portfolios for one process. Warm sessions (daemon) cache
+    them; cold sessions build them per command."""
+
+    def __init__(self, warm: bool = False):
+        self._warm = warm
+        self._market = None
+        self._portfolios: Dict[str, object] = {}
+        self._seen: Dict[str, tuple] = {}  # on-disk state each cache entry reflects
+
+    def market(self):
+        if self._market is None:
+            from quantnest.domain.market import MarketProvider
+            self._market = MarketProvider()
+        return self._market
+
+    def portfolio(self, wallet_id: str):
+        if self._seen.get(wallet_id) != _disk_state(wallet_id):
+            self._portfolios.pop(wallet_id, None)  # written elsewhere - reload
+        if wallet_id not in self._portfolios:
+            from quantnest.domain.portfolio import Portfolio
+            portfolio = Portfolio(wallet_id, self.market())
+            if not self._warm:
+                return portfolio
+            self._portfolios[wallet_id] = portfolio
+            self._seen[wallet_id] = _disk_state(wallet_id)
+        return self._portfolios[wallet_id]
+
+    def saved(self, wallet_id: str) -> None:
+        """Our own writes are already in the cached objects - step past them.
+
+        Only writes that chain from the state we had seen count; if anyone
+        else wrote in between, the seen state stops short of the file and
+        the next command reloads."""
+        from quantnest.infra.storage import file_state, pop_writes
+
+        paths = _files(wallet_id)
+        writes = [pop_writes(path) for path in paths]  # drained even when cold
+        if wallet_id not in self._portfolios:
+            return
+        seen = list(self._seen[wallet_id])
+        for k, path in enumerate(paths):
+            current = file_state(path)
+            while seen[k] != current and seen[k] in writes[k]:
+                seen[k] = writes[k].pop(seen[k])
+        self._seen[wallet_id] = tuple(seen)
+
+    def wallet(self, wallet_id: str):
+        if self._warm:
+            return self.portfolio(wallet_id).wallet  # same ledger the trades use
+        from quantnest.domain.wallet import Wallet
+        return Wallet(wallet_id)
+
+
+# ==================================================
+# COMMANDS - each writes to `out`, returns exit code
+# ==================================================
+
+def cmd_balance(args, session: Session, out: TextIO) -> int:
+    out.write(f"₹{session.wallet(args.wallet).balance:,.2f}\n")
+    return 0
+
+
+def cmd_credit(args, session: Session, out: TextIO) -> int:
+    wallet = session.wallet(args.wallet)
+    wallet.credit(args.amount, transaction_id=args.tx)
+    out.write(f"💰 Credited ₹{args.amount:,.2f} → ₹{wallet.balance:,.2f}\n")
+    return 0
+
+
+def cmd_debit(args, session: Session, out: TextIO) -> int:
+    wallet = session.wallet(args.wallet)
+    wallet.debit(args.amount, transaction_id=args.tx)
+    out.write(f"💸 Debited ₹{args.amount:,.2f} → ₹{wallet.balance:,.2f}\n")
+    return 0
+
+
+def cmd_buy(args, session: Session, out: TextIO) -> int:
+    portfolio = session.portfolio(args.wallet)
+    portfolio.buy(args.symbol.upper(), args.quantity, transaction_id=args.tx)
+    out.write(f"📈 Bought {args.quantity} {args.symbol.upper()} → cash ₹{portfolio.cash():,.2f}\n")
+    return 0
+
+
+def cmd_sell(args, session: Session, out: TextIO) -> int:
+    portfolio = session.portfolio(args.wallet)
+    portfolio.sell(args.symbol.upper(), args.quantity, transaction_id=args.tx)
+    out.write(f"📉 Sold {args.quantity} {args.symbol.upper()} → cash ₹{portfolio.cash():,.2f}\n")
+    return 0
+
+
+def cmd_report(args, session: Session, out: TextIO) -> int:
+    p = session.portfolio(args.wallet)
+    out.write(f"💵 Cash:            ₹{p.cash():,.2f}\n")
+    for sym, value in p.asset_values().items():
+        out.write(f"📊 {sym:10} {p.positions[sym]:>6} ₹{value:,.2f}\n")
+    out.write(f"💎 Total portfolio: ₹{p.total_value():,.2f}\n")
+    out.write("\n📊 ALLOCATIONS\n")
+    for asset, pct in sorted(p.allocations().items(), key=lambda x: x[1], reverse=True):
+        out.write(f"  {asset:10} {pct:.1%}\n")
+    out.write("\n🚨 HEALTH SIGNALS\n")
+    for signal in p.health_signals() or ["✅ All clear"]:
+        out.write(f"  {signal}\n")
+    return 0
+
+
+def cmd_replay(args, session: Session, out: TextIO) -> int:
+    # Always from disk, even when warm - this is the ledger proof
+    from quantnest.domain.wallet import Wallet
+    wallet = Wallet(args.wallet)
+    out.write(f"🎬 Replayed {len(wallet.events)} events → ₹{wallet.balance:,.2f}\n")
+    return 0
+
+
+def cmd_compact(args, session: Session, out: TextIO) -> int:
+    from quantnest.infra.storage import compact_events
+    before, after = compact_events(args.wallet)
+    out.write(f"💾 Compacted events: {before:,} → {after:,} bytes\n")
+    return 0
+
+
+# ==================================================
+# PARSER
+# ==================================================
+
+def _amount(text: str) -> Decimal:
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"not a number: {text}")
+    if not value.is_finite():
+        raise argparse.ArgumentTypeError(f"not a finite number: {text}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="quantnest", description="QuantNest trading simulator")
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get(SOCKET_ENV, DEFAULT_SOCKET),
+        help=f"daemon socket (default ${SOCKET_ENV} or {DEFAULT_SOCKET})",
+    )
+    parser.add_argument("--no-daemon", action="store_true", help="never forward to a daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def command(name, func, help, tx=False):
+        p = sub.add_parser(name, help=help)
+        p.set_defaults(func=func)
+        p.add_argument("wallet", help="wallet id")
+        if tx:
+            p.add_argument("--tx", help="transaction id (retries with the same id are no-ops)")
+        return p
+
+    command("balance", cmd_balance, "show cash balance")
+    command("credit", cmd_credit, "add money", tx=True).add_argument("amount", type=_amount)
+    command("debit", cmd_debit, "spend money", tx=True).add_argument("amount", type=_amount)
+    for name, func, help in (("buy", cmd_buy, "buy an asset"), ("sell", cmd_sell, "sell an asset")):
+        p = command(name, func, help, tx=True)
+        p.add_argument("symbol")
+        p.add_argument("quantity", type=_amount)
+    command("report", cmd_report, "portfolio analytics and health signals")
+    command("replay", cmd_replay, "rebuild balance from the event log on disk")
+    command("compact", cmd_compact, "rewrite the event log and trade journal without whitespace")
+
+    daemon = sub.add_parser("daemon", help="keep wallets warm behind a Unix socket")
+    daemon.set_defaults(func=None)
+    return parser
+
+
+def run(argv: List[str], session: Session, out: TextIO, err: TextIO) -> int:
+    """Parse and execute one command. Usage errors return 2, never exit."""
+    from contextlib import redirect_stderr, redirect_stdout
+    from quantnest.domain.market import UnknownSymbolError
+    from quantnest.domain.wallet import InsufficientFundsError
+
+    try:
+        # argparse prints usage / --help itself and then exits
+        with redirect_stdout(out), redirect_stderr(err):
+            args = build_parser().parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 2
+    if args.func is None:
+        err.write(f"error: {args.command} cannot run here\n")
+        return 2
+
+    try:
+        return args.func(args, session, out)
+    except (ValueError, InsufficientFundsError, UnknownSymbolError) as e:
+        err.write(f"error: {e}\n")
+        return 1
+    finally:
+        session.saved(args.wallet)
+
+
+# ==================================================
+# DAEMON - one JSON line in, one JSON line out
+# ==================================================
+
+def _listening(socket_path: str) -> bool:
+    """True if a process accepts connections on socket_path."""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+def make_server(socket_path: str):
+    """Bind a daemon server to socket_path (call serve_forever() to run it).
+
+    Raises RuntimeError if another daemon is already listening there.
+    Closing the server removes the socket, unless it has been replaced."""
+    import io
+    import socketserver
+
+    session = Session(warm=True)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return  # connected and left - e.g. another daemon probing
+            out, err = io.StringIO(), io.StringIO()
+            try:
+                request = json.loads(line)
+                code = run(list(request["argv"]), session, out, err)
+            except Exception as e:  # keep serving; report to the client
+                err.write(f"error: {e}\n")
+                code = 1
+            reply = {"code": code, "out": out.getvalue(), "err": err.getvalue()}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+    class Server(socketserver.UnixStreamServer):
+        def server_bind(self):
+            super().server_bind()
+            self.inode = os.stat(socket_path).st_ino
+
+        def server_close(self):
+            super().server_close()
+            try:
+                if os.stat(socket_path).st_ino == self.inode:
+                    os.unlink(socket_path)
+            except FileNotFoundError:
+                pass
+
+    if os.path.exists(socket_path):
+        if _listening(socket_path):
+            raise RuntimeError(f"a daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # stale socket from a daemon that died
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    return Server(socket_path, Handler)
+
+
+def serve(socket_path: str) -> None:
+    """Serve commands on socket_path until interrupted (one at a time)."""
+    with make_server(socket_path) as server:
+        print(f"🔥 quantnest daemon listening on {socket_path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def forward(socket_path: str, argv: List[str]) -> Optional[int]:
+    """Run argv in the daemon - None if no daemon is listening."""
+    import socket
+
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps({"argv": argv}).encode() + b"\n")
+            reply = json.loads(sock.makefile("rb").readline())
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
+    sys.stdout.write(reply["out"])
+    sys.stderr.write(reply["err"])
+    return reply["code"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = build_parser().parse_args(argv)  # usage errors and --help stay local
+
+    if args.command == "daemon":
+        try:
+            serve(args.socket)
+        except RuntimeError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    # The daemon only needs the command itself, not client options
+    command = argv[argv.index(args.command):]
+    if not args.no_daemon:
+        code = forward(args.socket, command)
+        if code is not None:
+            return code
+    return run(command, Session(), sys.stdout, sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
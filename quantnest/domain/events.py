@@ -32,6 +32,15 @@ class DomainEvent:
             return FundsDebited.from_dict(data)
         raise ValueError(f"Unknown event type: {event_type}")
 
+def _recorded(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the original event_id / timestamp when reloading (if present)."""
+    kwargs: Dict[str, Any] = {}
+    if "event_id" in data:
+        kwargs["event_id"] = uuid.UUID(data["event_id"])
+    if "timestamp" in data:
+        kwargs["timestamp"] = datetime.fromisoformat(data["timestamp"])
+    return kwargs
+
 @dataclass(kw_only=True)
 class FundsCredited(DomainEvent):
     event_type: str = "FundsCredited"
@@ -49,7 +58,8 @@ class FundsCredited(DomainEvent):
             transaction_id = str(uuid.uuid4())
         return cls(
             transaction_id=transaction_id,
-            amount=Decimal(data["payload"]["amount"])
+            amount=Decimal(data["payload"]["amount"]),
+            **_recorded(data),
         )
 
 @dataclass(kw_only=True)
@@ -69,5 +79,6 @@ class FundsDebited(DomainEvent):
             transaction_id = str(uuid.uuid4())
         return cls(
             transaction_id=transaction_id,
-            amount=Decimal(data["payload"]["amount"])
+            amount=Decimal(data["payload"]["amount"]),
+            **_recorded(data),
         )
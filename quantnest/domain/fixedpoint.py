@@ -0,0 +1,104 @@
+"""Exact Decimal <-> integer packing for vectorized analytics.
+
+Decimals are scaled to integers so NumPy can work on them without float
+rounding. Arrays stay int64 while the caller's worst case fits, otherwise
+they fall back to Python ints (dtype=object) - slower, but still exact."""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+# Leave one bit of slack so sums of in-bound products cannot overflow
+INT64_LIMIT = 2**62
+
+
+def places(values: Iterable[Decimal]) -> int:
+    """Decimal places needed to represent every value exactly."""
+    return max((max(-v.as_tuple().exponent, 0) for v in values), default=0)
+
+
+def scale(value: Decimal, n_places: int) -> int:
+    """Exact integer for value * 10**n_places (value must fit n_places)."""
+    scaled = value.scaleb(n_places)
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"{value} needs more than {n_places} decimal places")
+    return int(scaled)
+
+
+def dtype_for(bound: int):
+    """int64 when |values| stay under bound, else exact Python ints."""
+    return np.int64 if bound < INT64_LIMIT else object
+
+
+def round_half_up(units: np.ndarray, from_places: int, to_places: int) -> np.ndarray:
+    """Re-scale non-negative fixed-point units, rounding half up."""
+    if from_places <= to_places:
+        return units * 10 ** (to_places - from_places)
+    step = 10 ** (from_places - to_places)
+    return (2 * units + step) // (2 * step)
+
+
+def unpack(units: int, n_places: int) -> Decimal:
+    """Decimal for a fixed-point integer."""
+    return Decimal(int(units)).scaleb(-n_places)
+
+
+@dataclass
+class Book:
+    """Positions and cash of many portfolios as fixed-point matrices.
+
+    quantities: portfolio x symbol, units of 10**-qty_places
+    prices:     per symbol, units of 10**-price_places
+    cash:       per portfolio, units of 10**-(qty_places + price_places),
+                the same units as quantities * prices
+    """
+    symbols: List[str]
+    quantities: np.ndarray
+    prices: np.ndarray
+    cash: np.ndarray
+    qty_places: int
+    price_places: int
+
+    @property
+    def value_places(self) -> int:
+        return self.qty_places + self.price_places
+
+
+def pack_book(
+    positions: Sequence[Dict[str, Decimal]],
+    prices: Dict[str, Decimal],
+    cash: Sequence[Decimal],
+    min_qty_places: int = 0,
+    min_price_places: int = 0,
+) -> Book:
+    """Pack positions against one price snapshot (one column per price)."""
+    symbols = list(prices)
+    column = {sym: j for j, sym in enumerate(symbols)}
+
+    qty_places = max(places(q for pos in positions for q in pos.values()), min_qty_places)
+    price_places = max(
+        places(prices.values()), places(cash) - qty_places, min_price_places, 0
+    )
+    qty = [[(column[s], scale(q, qty_places)) for s, q in pos.items()] for pos in positions]
+    price_units = [scale(p, price_places) for p in prices.values()]
+    cash_units = [scale(c, qty_places + price_places) for c in cash]
+
+    # Worst case is 200x a total made of max quantity x max price everywhere
+    max_qty = max((abs(u) for row in qty for _, u in row), default=0)
+    max_row = max_qty * max(map(abs, price_units), default=0) * len(symbols)
+    dtype = dtype_for(400 * (max_row + max(map(abs, cash_units), default=0)))
+
+    quantities = np.zeros((len(positions), len(symbols)), dtype=dtype)
+    for i, row in enumerate(qty):
+        for j, units in row:
+            quantities[i, j] = units
+    return Book(
+        symbols=symbols,
+        quantities=quantities,
+        prices=np.array(price_units, dtype=dtype),
+        cash=np.array(cash_units, dtype=dtype),
+        qty_places=qty_places,
+        price_places=price_places,
+    )
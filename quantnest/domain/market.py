@@ -1,15 +1,39 @@
 """Market price provider - Single source of truth for all assets"""
 
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Dict
+from numbers import Integral
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+if TYPE_CHECKING:  # bar store pulls in NumPy - only needed for history
+    from quantnest.infra.bars import BarStore
+
+# Point in time: datetime (naive = UTC) or UTC epoch microseconds
+Timestamp = Union[datetime, int]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_micros(at: Timestamp) -> int:
+    """UTC epoch microseconds (naive datetimes are taken as UTC)."""
+    if isinstance(at, Integral):
+        return int(at)
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return (at - EPOCH) // timedelta(microseconds=1)
+
 
 class UnknownSymbolError(ValueError):
     """Raised when a symobol is not found in the market"""
 
+class NoPriceError(ValueError):
+    """Raised when a symbol has no bar at or before the requested time"""
+
 class MarketProvider():
-    """Mock market with deterministic prices"""
+    """Mock market with deterministic prices, plus optional bar history"""
 
-    def __init__(self):
+    def __init__(self, bars: Optional["BarStore"] = None):
+        self._bars = bars
         self._prices: Dict[str, Decimal] = {
             "RELIANCE": Decimal("2500.00"),
             "TCS": Decimal("3800.00"),
@@ -17,9 +41,20 @@ class MarketProvider():
             "HDFCBANK": Decimal("1550.00"),
         }
     
-    def get_price(self, symbol: str) -> Decimal:
-        """Get current price for symbol."""
+    def get_price(self, symbol: str, at: Optional[Timestamp] = None) -> Decimal:
+        """Get current price for symbol, or its close as of `at`."""
         symbol = symbol.upper()
+        if at is not None:
+            return self._price_at(symbol, at)
         if symbol not in self._prices:
             raise UnknownSymbolError(f"Unknown symbol: {symbol}")
-        return self._prices[symbol]
\ No newline at end of file
+        return self._prices[symbol]
+
+    def _price_at(self, symbol: str, at: Timestamp) -> Decimal:
+        """Point-in-time close via binary search in the bar store."""
+        if self._bars is None or symbol not in self._bars:
+            raise UnknownSymbolError(f"No price history for symbol: {symbol}")
+        price = self._bars.close_at(symbol, at)
+        if price is None:
+            raise NoPriceError(f"No {symbol} price at or before {at}")
+        return price
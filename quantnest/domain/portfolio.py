@@ -2,11 +2,15 @@
 
 import uuid
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from .wallet import Wallet
-from .market import MarketProvider
+from .wallet import InsufficientFundsError, Wallet
+from .market import MarketProvider, Timestamp, to_micros
 from .trade import Trade
+from quantnest.infra.storage import load_trades, append_trade
+
+if TYPE_CHECKING:  # planner pulls in NumPy - import it on first rebalance()
+    from .rebalance import Order
 
 # Money formatting (2 decimal places, round half up)
 MONEY = Decimal("0.01")
@@ -19,10 +23,12 @@ def _money(x: Decimal) -> Decimal:
 
 class Portfolio:
     def __init__(self, wallet_id: str, market: MarketProvider):
+        self._wallet_id = wallet_id
         self._wallet = Wallet(wallet_id)
         self._market = market
         self._positions: Dict[str, Decimal] = {}
         self._trades: List[Trade] = []
+        self._replay_trades()  # Positions derived from the trade journal
 
     @property
     def wallet(self) -> Wallet:
@@ -44,62 +50,127 @@ class Portfolio:
 
         # DAY 5: Generate unique transaction ID (your UPI receipt)
         tx_id = transaction_id or str(uuid.uuid4())
+        if self._has_trade(tx_id):
+            return  # Idempotent!
 
+        self._check_unused(tx_id)
         price = self._market.get_price(symbol)
         cost = price * quantity
+        if cost > self.wallet.balance:
+            raise InsufficientFundsError(f"Cannot debit ₹{cost} from ₹{self.wallet.balance}")
 
-        # Pass transaction_id to wallet → idempotent & safe!
+        # Journal first: a trade only counts once the wallet has the debit
+        trade = Trade(symbol, "BUY", quantity, price, transaction_id=tx_id)
+        append_trade(trade, self._wallet_id)
         self.wallet.debit(cost, transaction_id=tx_id)
-        self._positions[symbol] = self._positions.get(symbol, Decimal("0")) + quantity
-        self._trades.append(Trade(symbol, "BUY", quantity, price))
+        self._apply(trade)
 
     def sell(self, symbol: str, quantity: Decimal, transaction_id: str = None) -> None:
         """Sell quantity of symbol if owned."""
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
 
+        # DAY 5: Generate unique transaction ID
+        tx_id = transaction_id or str(uuid.uuid4())
+        if self._has_trade(tx_id):
+            return  # Idempotent!
+
+        self._check_unused(tx_id)
         owned = self._positions.get(symbol, Decimal("0"))
         if quantity > owned:
             raise ValueError(f"Cannot sell {quantity}, own only {owned}")
 
-        # DAY 5: Generate unique transaction ID
-        tx_id = transaction_id or str(uuid.uuid4())
-
         price = self._market.get_price(symbol)
         proceeds = price * quantity
 
-        # Pass transaction_id to wallet → idempotent & safe!
+        # Journal first: a trade only counts once the wallet has the credit
+        trade = Trade(symbol, "SELL", quantity, price, transaction_id=tx_id)
+        append_trade(trade, self._wallet_id)
         self.wallet.credit(proceeds, transaction_id=tx_id)
-        self._positions[symbol] = owned - quantity
-        if self._positions[symbol] == 0:
-            del self._positions[symbol]
-        self._trades.append(Trade(symbol, "SELL", quantity, price))
+        self._apply(trade)
+
+    def _has_trade(self, tx_id: str) -> bool:
+        return any(t.transaction_id == tx_id for t in self._trades)
+
+    def _check_unused(self, tx_id: str) -> None:
+        """A new trade's id must not already belong to a wallet event -
+        the wallet would skip it as a retry and the trade would never count."""
+        if self.wallet.has_transaction(tx_id):
+            raise ValueError(f"Transaction {tx_id} is already used in the wallet")
+
+    def _apply(self, trade: Trade) -> None:
+        """Move the position and record the trade."""
+        sign = 1 if trade.side == "BUY" else -1
+        qty = self._positions.get(trade.symbol, Decimal("0")) + sign * trade.quantity
+        if qty == 0:
+            self._positions.pop(trade.symbol, None)
+        else:
+            self._positions[trade.symbol] = qty
+        self._trades.append(trade)
+
+    def _replay_trades(self) -> None:
+        """Rebuild positions from journaled trades the wallet ledger paid for.
+
+        A trade is journaled before its wallet event, so a crash or a failed
+        debit in between leaves a journal entry with no matching event - it
+        is skipped, exactly as if the trade never happened."""
+        paid = {
+            (e.transaction_id, e.event_type, Decimal(e.payload["amount"]))
+            for e in self._wallet.events
+        }
+        applied = set()
+        for trade in load_trades(self._wallet_id):
+            event_type = "FundsDebited" if trade.side == "BUY" else "FundsCredited"
+            key = (trade.transaction_id, event_type, trade.total_value)
+            if key in paid and trade.transaction_id not in applied:
+                applied.add(trade.transaction_id)
+                self._apply(trade)
 
     # ==================================================
     # DAY 4: READ-ONLY ANALYTICS (No side effects)
     # ==================================================
 
-    def cash(self) -> Decimal:
+    # Every `at` below means point in time: holdings as they were then
+    # (from trade and wallet event timestamps), priced at that time's close.
+
+    def positions_at(self, at: Timestamp) -> Dict[str, Decimal]:
+        """Positions held at `at`, replayed from the trades made by then."""
+        cutoff = to_micros(at)
+        held: Dict[str, Decimal] = {}
+        for t in self._trades:
+            if to_micros(t.timestamp) <= cutoff:
+                sign = 1 if t.side == "BUY" else -1
+                held[t.symbol] = held.get(t.symbol, Decimal("0")) + sign * t.quantity
+        return {sym: qty for sym, qty in held.items() if qty != 0}
+
+    def _holdings(self, at: Optional[Timestamp]) -> Dict[str, Decimal]:
+        return self._positions if at is None else self.positions_at(at)
+
+    def cash(self, at: Optional[Timestamp] = None) -> Decimal:
         """Cash balance (wallet.balance rounded)."""
-        return _money(self.wallet.balance)
+        balance = self.wallet.balance if at is None else self.wallet.balance_at(at)
+        return _money(balance)
 
-    def asset_value(self, symbol: str) -> Decimal:
+    def asset_value(self, symbol: str, at: Optional[Timestamp] = None) -> Decimal:
         """Market value of single asset position."""
-        qty = self._positions.get(symbol, Decimal("0"))
-        price = self._market.get_price(symbol)
+        qty = self._holdings(at).get(symbol, Decimal("0"))
+        price = self._market.get_price(symbol, at=at)
         return _money(qty * price)
 
-    def asset_values(self) -> Dict[str, Decimal]:
+    def asset_values(self, at: Optional[Timestamp] = None) -> Dict[str, Decimal]:
         """Market value of all asset positions."""
-        return {sym: self.asset_value(sym) for sym in self._positions}
+        return {
+            sym: _money(qty * self._market.get_price(sym, at=at))
+            for sym, qty in self._holdings(at).items()
+        }
 
-    def total_asset_value(self) -> Decimal:
+    def total_asset_value(self, at: Optional[Timestamp] = None) -> Decimal:
         """Sum of all asset market values."""
-        return _money(sum(self.asset_values().values(), start=Decimal("0")))
+        return _money(sum(self.asset_values(at=at).values(), start=Decimal("0")))
 
-    def total_value(self) -> Decimal:
+    def total_value(self, at: Optional[Timestamp] = None) -> Decimal:
         """Cash + total asset value."""
-        return _money(self.cash() + self.total_asset_value())
+        return _money(self.cash(at=at) + self.total_asset_value(at=at))
 
     def avg_cost(self, symbol: str) -> Decimal:
         """Average purchase price (weighted by quantity)."""
@@ -155,3 +226,23 @@ class Portfolio:
             signals.append(f"⚠️ Low cash buffer: {cash_pct:.1%}")
 
         return signals
+
+    def rebalance(
+        self,
+        target_weights: Dict[str, Decimal],
+        tolerance: Decimal = Decimal("0.01"),
+        lot_size: Decimal = Decimal("1"),
+    ) -> List["Order"]:
+        """Plan orders (sells first) that bring weights within tolerance.
+
+        Symbols already within tolerance are left alone unless cash needs
+        them. Weights are fractions of total value; whatever they leave is
+        the cash target. Read-only: execute the plan with buy() / sell()."""
+        from .rebalance import plan_rebalance
+
+        symbols = dict.fromkeys([*self._positions, *target_weights])
+        prices = {sym: self._market.get_price(sym) for sym in symbols}
+        return plan_rebalance(
+            [self._positions], [self.wallet.balance], prices,
+            target_weights, tolerance, lot_size,
+        )[0]
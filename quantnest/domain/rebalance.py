@@ -0,0 +1,144 @@
+"""Target-weight rebalancing - plan a small order set from one price snapshot.
+
+Planning is vectorized over a Book (see fixedpoint.py) so one call can plan a
+whole fleet. Cash checks are exact integer math: executing a plan at the
+snapshot prices can never overdraw the wallet or go short."""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Literal, Sequence, Tuple
+
+import numpy as np
+
+from .fixedpoint import Book, pack_book, places, scale
+
+
+@dataclass(frozen=True)
+class Order:
+    """Planned trade - execute with Portfolio.buy / Portfolio.sell."""
+    symbol: str
+    side: Literal["BUY", "SELL"]
+    quantity: Decimal
+    price: Decimal
+
+
+def validate_targets(
+    target_weights: Dict[str, Decimal], tolerance: Decimal, lot_size: Decimal
+) -> None:
+    """Business rules for a rebalance request."""
+    if any(w < 0 for w in target_weights.values()):
+        raise ValueError("Target weights must not be negative")
+    if sum(target_weights.values(), start=Decimal("0")) > 1:
+        raise ValueError("Target weights must sum to at most 1 (rest is cash)")
+    if tolerance < 0:
+        raise ValueError("Tolerance must not be negative")
+    if lot_size <= 0:
+        raise ValueError("Lot size must be positive")
+
+
+def plan_lots(
+    book: Book, weights: np.ndarray, tolerance: float, lot_units: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(sell lots, buy lots) per portfolio x symbol.
+
+    Only symbols drifted beyond tolerance are traded. If that still leaves
+    cash off target, symbols within tolerance on the side that moves cash
+    back are traded too. Sells are capped at whole lots held; buys are
+    scaled down to the cash available after the sells, and any cash left
+    by rounding goes lot by lot to the largest remaining shortfall."""
+    values = book.quantities * book.prices
+    totals = book.cash + values.sum(axis=1)
+    lot_cost = lot_units * book.prices
+
+    # Floats only steer the targets; every cash check below is exact
+    value_f = values.astype(float)
+    total_f = totals.astype(float)
+    funded = total_f > 0
+    safe_total = np.where(funded, total_f, 1.0)[:, None]
+    drift = value_f / safe_total - weights
+    cash_target = 1.0 - weights.sum()
+
+    priced = lot_cost > 0
+    tradable = funded[:, None] & priced
+    cost_f = np.where(priced, lot_cost.astype(float), 1.0)
+    delta = np.rint(-drift * safe_total / cost_f).astype(np.int64)
+    held = (book.quantities // lot_units).astype(np.int64)
+
+    def lots_for(trade):
+        sells = np.where(trade & (delta < 0), np.minimum(-delta, held), 0)
+        buys = np.where(trade & (delta > 0), delta, 0)
+        return sells, buys
+
+    trade = tradable & (np.abs(drift) > tolerance)
+    sells, buys = lots_for(trade)
+    cash_after = book.cash.astype(float) + ((sells - buys) * cost_f).sum(axis=1)
+    cash_drift = cash_after / safe_total[:, 0] - cash_target
+    trade |= tradable & (
+        ((cash_drift[:, None] < -tolerance) & (drift > 0))
+        | ((cash_drift[:, None] > tolerance) & (drift < 0))
+    )
+    sells, buys = lots_for(trade)
+
+    available = book.cash + (sells * lot_cost).sum(axis=1)
+    cost = (buys * lot_cost).sum(axis=1)
+    short = np.flatnonzero(cost > available)
+    if short.size:
+        wanted = buys[short]
+        ratio = available[short].astype(float) / cost[short].astype(float)
+        scaled = np.floor(wanted * ratio[:, None]).astype(np.int64)
+        # Float ratios can round up by a lot; redo those rows in exact ints
+        for k, i in enumerate(short):
+            if (scaled[k] * lot_cost).sum() > available[i]:
+                a, c = int(available[i]), int(cost[i])
+                scaled[k] = [int(b) * a // c for b in wanted[k]]
+
+        # Flooring can strand up to a lot per symbol - hand it back one lot
+        # at a time to whichever symbol is furthest below its target
+        gap = -drift[short] * safe_total[short] - scaled * cost_f
+        remaining = available[short] - (scaled * lot_cost).sum(axis=1)
+        while True:
+            fits = (scaled < wanted) & (lot_cost <= remaining[:, None])
+            rows = np.flatnonzero(fits.any(axis=1))
+            if not rows.size:
+                break
+            cols = np.where(fits[rows], gap[rows], -np.inf).argmax(axis=1)
+            scaled[rows, cols] += 1
+            gap[rows, cols] -= cost_f[cols]
+            remaining[rows] = remaining[rows] - lot_cost[cols]
+        buys[short] = scaled
+    return sells, buys
+
+
+def plan_rebalance(
+    positions: Sequence[Dict[str, Decimal]],
+    balances: Sequence[Decimal],
+    prices: Dict[str, Decimal],
+    target_weights: Dict[str, Decimal],
+    tolerance: Decimal = Decimal("0.01"),
+    lot_size: Decimal = Decimal("1"),
+) -> List[List[Order]]:
+    """Orders per portfolio (sells first) to reach target_weights.
+
+    prices must cover every held and targeted symbol; symbols without a
+    target weight are sold down to zero."""
+    validate_targets(target_weights, tolerance, lot_size)
+
+    book = pack_book(positions, prices, balances, min_qty_places=places([lot_size]))
+    weights = np.array(
+        [float(target_weights.get(s, 0)) for s in book.symbols], dtype=float
+    )
+    lot_units = scale(lot_size, book.qty_places)
+    sells, buys = plan_lots(book, weights, float(tolerance), lot_units)
+
+    plans: List[List[Order]] = [[] for _ in positions]
+    for side, lots in (("SELL", sells), ("BUY", buys)):
+        for i, j in zip(*np.nonzero(lots)):
+            sym = book.symbols[j]
+            plans[i].append(Order(sym, side, lot_size * int(lots[i, j]), prices[sym]))
+
+    # Sells first, then the portfolio's own order: held symbols, then targets
+    for pos, plan in zip(positions, plans):
+        if len(plan) > 1:
+            rank = {s: k for k, s in enumerate(dict.fromkeys([*pos, *target_weights]))}
+            plan.sort(key=lambda o: (o.side != "SELL", rank[o.symbol]))
+    return plans
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Literal
+from typing import Any, Dict, Literal, Optional
 from decimal import Decimal
 
 @dataclass(frozen=True)
@@ -11,9 +11,31 @@ class Trade:
     side: Literal["BUY","SELL"]
     quantity: Decimal
     price: Decimal
-    timestamp: datetime = field(default=datetime.now)
+    timestamp: datetime = field(default_factory=datetime.now)
+    transaction_id: Optional[str] = None  # wallet event that paid for it
 
     @property
     def total_value(self) -> Decimal:
         """Quantity x Price"""
-        return self.quantity * self.price
\ No newline at end of file
+        return self.quantity * self.price
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": str(self.quantity),
+            "price": str(self.price),
+            "timestamp": self.timestamp.isoformat(),
+            "transaction_id": self.transaction_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Trade':
+        return cls(
+            symbol=data["symbol"],
+            side=data["side"],
+            quantity=Decimal(data["quantity"]),
+            price=Decimal(data["price"]),
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            transaction_id=data.get("transaction_id"),
+        )
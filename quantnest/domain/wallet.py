@@ -5,6 +5,7 @@ import uuid
 from decimal import Decimal
 from typing import List
 from .events import DomainEvent, FundsCredited, FundsDebited
+from .market import Timestamp, to_micros
 from quantnest.infra.storage import load_events, append_event
 
 
@@ -28,6 +29,10 @@ class Wallet:
         """Immutable audit trail - complete movie of all transactions."""
         return self._events.copy()
 
+    def has_transaction(self, transaction_id: str) -> bool:
+        """True if an event with this transaction id is already recorded."""
+        return any(e.transaction_id == transaction_id for e in self._events)
+
     def credit(self, amount: Decimal, transaction_id: str = None) -> None:
         """Add money - idempotent (safe to retry same payment)."""
         if amount <= 0:
@@ -36,7 +41,7 @@ class Wallet:
         tx_id = transaction_id or str(uuid.uuid4())
 
         # ← DAY 5: Skip if already processed (no double credit!)
-        if any(e.transaction_id == tx_id for e in self._events):
+        if self.has_transaction(tx_id):
             return  # Idempotent!
 
         event = FundsCredited(amount=amount, transaction_id=tx_id)
@@ -58,7 +63,7 @@ class Wallet:
         tx_id = transaction_id or str(uuid.uuid4())
 
         # ← DAY 5: Skip if already processed (no double debit!)
-        if any(e.transaction_id == tx_id for e in self._events):
+        if self.has_transaction(tx_id):
             return  # Idempotent!
 
         event = FundsDebited(amount=amount, transaction_id=tx_id)
@@ -66,6 +71,20 @@ class Wallet:
         append_event(event, self._wallet_id)
         self._replay_events()  # Recompute balance from ALL events
 
+    def balance_at(self, at: Timestamp) -> Decimal:
+        """Balance replayed from the events recorded at or before `at`."""
+        cutoff = to_micros(at)
+        balance = Decimal("0")
+        for event in self._events:
+            if to_micros(event.timestamp) > cutoff:
+                continue
+            amount = Decimal(event.payload["amount"])
+            if event.event_type == "FundsCredited":
+                balance += amount
+            elif event.event_type == "FundsDebited":
+                balance -= amount
+        return balance
+
     def _replay_events(self) -> None:
         """MAGIC: Rebuild balance from events (delete _balance → replay)."""
         self._balance = Decimal("0")
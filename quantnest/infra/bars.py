@@ -0,0 +1,198 @@
+"""On-disk OHLCV bar store - memory-mapped columns for point-in-time prices.
+
+Layout under root (default data/bars):
+    symbols.json              committed row count per symbol
+    <SYMBOL>/<column>.i8      one raw little-endian int64 file per column
+
+Timestamps are UTC epoch microseconds, prices are fixed-point with
+PRICE_PLACES decimals. Nothing is loaded into Python objects: columns are
+np.memmap views and lookups are a binary search over the timestamp column."""
+
+import csv
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from quantnest.domain.fixedpoint import scale, unpack
+from quantnest.domain.market import EPOCH, Timestamp, to_micros
+
+PRICE_PLACES = 4
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+DTYPE = np.dtype("<i8")
+
+@dataclass(frozen=True)
+class Bar:
+    ts: datetime
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    volume: int = 0
+
+
+class BarStore:
+    def __init__(self, root: Union[str, Path] = "data/bars"):
+        self._root = Path(root)
+        self._directory_file = self._root / "symbols.json"
+        self._rows: Dict[str, int] = self._load_directory()
+        self._maps: Dict[str, Dict[str, np.ndarray]] = {}
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self._rows)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def columns(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Read-only int64 views of every column (empty if no bars)."""
+        symbol = symbol.upper()
+        if symbol not in self._maps:
+            rows = self._rows.get(symbol, 0)
+            if rows == 0:
+                self._maps[symbol] = {c: np.empty(0, dtype=DTYPE) for c in COLUMNS}
+            else:
+                self._maps[symbol] = {
+                    c: np.memmap(self._column_file(symbol, c), dtype=DTYPE, mode="r", shape=(rows,))
+                    for c in COLUMNS
+                }
+        return self._maps[symbol]
+
+    def close_at(self, symbol: str, at: Timestamp) -> Optional[Decimal]:
+        """Close of the last bar at or before `at` (None if there is none)."""
+        cols = self.columns(symbol)
+        idx = int(np.searchsorted(cols["ts"], to_micros(at), side="right")) - 1
+        if idx < 0:
+            return None
+        return unpack(cols["close"][idx], PRICE_PLACES)
+
+    def append(self, symbol: str, bars: Iterable[Bar]) -> int:
+        """Append bars in time order - returns how many were written."""
+        return self.append_many({symbol: bars})[symbol.upper()]
+
+    def append_many(self, bars_by_symbol: Dict[str, Iterable[Bar]]) -> Dict[str, int]:
+        """Append bars for several symbols - all or nothing.
+
+        Every symbol is validated before any file is touched, and rows only
+        become visible once the directory records them, in one write."""
+        encoded = {}
+        for symbol, bars in bars_by_symbol.items():
+            symbol = symbol.upper()
+            encoded[symbol] = self._encode(symbol, list(bars))
+
+        for symbol, data in encoded.items():
+            if data["ts"].size:
+                self._write(symbol, data)
+        for symbol, data in encoded.items():
+            self._rows[symbol] = self._rows.get(symbol, 0) + data["ts"].size
+        if any(data["ts"].size for data in encoded.values()):
+            self._save_directory()
+        return {symbol: int(data["ts"].size) for symbol, data in encoded.items()}
+
+    def _encode(self, symbol: str, bars: List[Bar]) -> Dict[str, np.ndarray]:
+        """Columns for bars, or ValueError if they cannot be appended."""
+        try:
+            for b in bars:
+                if int(b.volume) != b.volume:
+                    raise ValueError(f"volume must be a whole number, got {b.volume}")
+            data = {
+                "ts": [to_micros(b.ts) for b in bars],
+                "open": [scale(b.open, PRICE_PLACES) for b in bars],
+                "high": [scale(b.high, PRICE_PLACES) for b in bars],
+                "low": [scale(b.low, PRICE_PLACES) for b in bars],
+                "close": [scale(b.close, PRICE_PLACES) for b in bars],
+                "volume": [int(b.volume) for b in bars],
+            }
+            columns = {c: np.array(data[c], dtype=DTYPE) for c in COLUMNS}
+        except (ValueError, OverflowError) as e:
+            raise ValueError(f"{symbol}: {e}") from e
+
+        ts = columns["ts"]
+        last = self.columns(symbol)["ts"]
+        if np.any(np.diff(ts) <= 0) or (len(last) and ts.size and ts[0] <= last[-1]):
+            raise ValueError(f"Bars for {symbol} must have strictly increasing timestamps")
+        return columns
+
+    def _write(self, symbol: str, data: Dict[str, np.ndarray]) -> None:
+        rows = self._rows.get(symbol, 0)
+        self._maps.pop(symbol, None)  # drop views before touching the files
+        (self._root / symbol).mkdir(parents=True, exist_ok=True)
+        for c in COLUMNS:
+            with open(self._column_file(symbol, c), "ab") as f:
+                f.truncate(rows * DTYPE.itemsize)  # discard any half-written tail
+                data[c].tofile(f)
+
+    def _column_file(self, symbol: str, column: str) -> Path:
+        return self._root / symbol / f"{column}.i8"
+
+    def _load_directory(self) -> Dict[str, int]:
+        try:
+            return json.loads(self._directory_file.read_text())
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _save_directory(self) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        tmp = self._directory_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._rows, indent=2, sort_keys=True))
+        tmp.replace(self._directory_file)
+
+
+def _parse_ts(text: str) -> datetime:
+    text = text.strip()
+    if text.isdigit():
+        return EPOCH + timedelta(seconds=int(text))
+    return datetime.fromisoformat(text)
+
+
+def import_csv(
+    store: BarStore, path: Union[str, Path], symbol: Optional[str] = None
+) -> Dict[str, int]:
+    """Load bars from CSV (timestamp,open,high,low,close[,volume][,symbol]).
+
+    Timestamps are ISO 8601 or epoch seconds. Without a symbol column, pass
+    `symbol`. Rows may be in any order. All or nothing: a bad row anywhere
+    raises ValueError before any bar is written. Returns bars per symbol."""
+    by_symbol: Dict[str, List[Bar]] = {}
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames or []
+        ts_column = "timestamp" if "timestamp" in header else "ts"
+        required = [ts_column, "open", "high", "low", "close"]
+        missing = [c for c in required if c not in header]
+        if missing:
+            raise ValueError(f"{path}: missing column(s): {', '.join(missing)}")
+        if "symbol" not in header and not symbol:
+            raise ValueError(f"{path}: no symbol column and no symbol given")
+
+        for row in reader:
+            line = reader.line_num
+            empty = [c for c in required if not row[c]]
+            if empty:
+                raise ValueError(f"{path}:{line}: missing value(s): {', '.join(empty)}")
+            sym = (row.get("symbol") or symbol or "").upper()
+            if not sym:
+                raise ValueError(f"{path}:{line}: no symbol")
+            try:
+                bar = Bar(
+                    ts=_parse_ts(row[ts_column]),
+                    open=Decimal(row["open"]),
+                    high=Decimal(row["high"]),
+                    low=Decimal(row["low"]),
+                    close=Decimal(row["close"]),
+                    volume=Decimal(row.get("volume") or 0),
+                )
+            except (ValueError, ArithmeticError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{line}: {e}") from e
+            by_symbol.setdefault(sym, []).append(bar)
+    return store.append_many({
+        sym: sorted(bars, key=lambda b: to_micros(b.ts)) for sym, bars in by_symbol.items()
+    })
@@ -1,7 +1,27 @@
 import json
+import os
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from quantnest.domain.events import DomainEvent
+from quantnest.domain.trade import Trade
+
+COMPACT = {"separators": (",", ":")}
+
+FileState = Optional[Tuple[int, int]]  # (mtime_ns, size), None if missing
+
+# Per file: state before -> state after, for every write this process made
+_writes: Dict[Path, Dict[FileState, FileState]] = {}
+
+def file_state(path: Path) -> FileState:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def pop_writes(path: Path) -> Dict[FileState, FileState]:
+    """This process's writes to path since the last call (before -> after)."""
+    return _writes.pop(Path(path), {})
 
 def get_event_file(wallet_id: str) -> Path:
     return Path(f"data/wallet_events_{wallet_id}.json")
@@ -25,8 +45,92 @@ def load_events(wallet_id: str = None) -> List[DomainEvent]:
 def append_event(event: DomainEvent, wallet_id: str = None) -> None:
     if wallet_id is None:
         return  # Tests don't persist
-    
-    events = load_events(wallet_id) + [event]
-    event_file = get_event_file(wallet_id)
-    event_file.parent.mkdir(parents=True, exist_ok=True)
-    event_file.write_text(json.dumps([e.to_dict() for e in events], indent=2))
+
+    _append_entry(get_event_file(wallet_id), event.to_dict())
+
+def get_trade_file(wallet_id: str) -> Path:
+    return Path(f"data/trades_{wallet_id}.json")
+
+def load_trades(wallet_id: str = None) -> List[Trade]:
+    """Trade journal - positions are rebuilt from it (see Portfolio)."""
+    if wallet_id is None:
+        return []
+
+    try:
+        text = get_trade_file(wallet_id).read_text().strip()
+        return [Trade.from_dict(t) for t in json.loads(text)] if text else []
+    except (json.JSONDecodeError, FileNotFoundError):
+        return []
+
+def append_trade(trade: Trade, wallet_id: str = None) -> None:
+    if wallet_id is None:
+        return  # Tests don't persist
+
+    _append_entry(get_trade_file(wallet_id), trade.to_dict())
+
+def compact_events(wallet_id: str) -> Tuple[int, int]:
+    """Rewrite the event log and trade journal without whitespace -
+    (bytes before, bytes after). Entries are copied verbatim; nothing is
+    dropped or re-generated."""
+    before = after = 0
+    for path in (get_event_file(wallet_id), get_trade_file(wallet_id)):
+        if path.exists():
+            text = path.read_text()
+            compact = json.dumps(json.loads(text or "[]"), **COMPACT)
+            _write_text(path, compact)
+            before, after = before + len(text.encode()), after + len(compact.encode())
+    return before, after
+
+def _append_entry(path: Path, entry: dict) -> None:
+    """Add one entry to a JSON array file without reading what is already
+    there: only the closing bracket is rewritten, and the entry is written
+    in the file's own style (compact or indent=2), so the bytes are the same
+    as a full rewrite. A missing, empty or unreadable file starts over."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with path.open("r+b") as f:
+            end = _array_end(f)
+            if end is not None:
+                pos, empty, compact = end
+                if compact:
+                    text = ("" if empty else ",") + json.dumps(entry, **COMPACT) + "]"
+                else:
+                    body = "\n".join("  " + line for line in json.dumps(entry, indent=2).splitlines())
+                    text = ("\n" if empty else ",\n") + body + "\n]"
+                before = _fstate(f)
+                f.seek(pos)
+                f.truncate()
+                f.write(text.encode())
+                f.flush()
+                _writes.setdefault(path, {})[before] = _fstate(f)
+                return
+    except FileNotFoundError:
+        pass
+    _write_text(path, json.dumps([entry], indent=2))
+
+def _write_text(path: Path, text: str) -> None:
+    before = file_state(path)
+    path.write_text(text)
+    _writes.setdefault(path, {})[before] = file_state(path)
+
+def _fstate(f) -> FileState:
+    st = os.fstat(f.fileno())
+    return st.st_mtime_ns, st.st_size
+
+def _array_end(f) -> Optional[Tuple[int, bool, bool]]:
+    """(offset of the closing bracket, array is empty, compact style) - or
+    None if the file does not end like a JSON array of objects."""
+    size = f.seek(0, 2)
+    if size == 0:
+        return None
+    f.seek(0)
+    compact = f.read(2) == b"[{"
+    f.seek(max(0, size - 256))
+    tail = f.read()
+    head = tail.rstrip()
+    if not head.endswith(b"]"):
+        return None
+    head = head[:-1].rstrip()
+    if not head or head[-1:] not in (b"[", b"}"):
+        return None
+    return size - len(tail) + len(head), head[-1:] == b"[", compact
@@ -0,0 +1,74 @@
+import random
+from decimal import Decimal
+from quantnest.app.fleet import Fleet
+from quantnest.domain.portfolio import Portfolio
+from quantnest.domain.market import MarketProvider
+
+SYMBOLS = ["RELIANCE", "TCS", "INFY", "HDFCBANK"]
+
+def _random_fleet(market, n, seed=7):
+    rng = random.Random(seed)
+    portfolios = []
+    for i in range(n):
+        p = Portfolio(None, market)
+        p.wallet.credit(Decimal(rng.randint(1, 200_000)) + Decimal(rng.randint(0, 99)) / 100)
+        for sym in rng.sample(SYMBOLS, rng.randint(0, 4)):
+            qty = Decimal(rng.randint(1, 40))
+            if qty * market.get_price(sym) <= p.wallet.balance:
+                p.buy(sym, qty)
+        portfolios.append(p)
+    return portfolios
+
+def test_fleet_matches_per_portfolio_analytics():
+    market = MarketProvider()
+    portfolios = _random_fleet(market, 200)
+    market._prices["TCS"] = Decimal("3812.37")  # move prices after trading
+
+    fleet = Fleet(portfolios, market)
+    cash_alloc, asset_alloc = fleet.allocations()
+    totals = fleet.total_values()
+
+    for i, p in enumerate(portfolios):
+        assert Decimal(int(totals[i])) / 100 == p.total_value()
+        alloc = p.allocations()
+        assert Decimal(int(cash_alloc[i])) / 100 == alloc["cash"]
+        for j, sym in enumerate(fleet.symbols):
+            if sym in alloc:
+                assert Decimal(int(asset_alloc[i, j])) / 100 == alloc[sym]
+
+def test_fleet_health_signals_identical():
+    market = MarketProvider()
+    portfolios = _random_fleet(market, 200, seed=11)
+    empty = Portfolio(None, market)  # zero total value → low cash only
+    portfolios.append(empty)
+
+    fleet = Fleet(portfolios, market)
+    for thresholds in [(Decimal("0.40"), Decimal("0.10")), (Decimal("0.255"), Decimal("0.305"))]:
+        expected = [p.health_signals(*thresholds) for p in portfolios]
+        assert fleet.health_signals(*thresholds) == expected
+    assert fleet.health_signals()[-1] == ["⚠️ Low cash buffer: 0.0%"]
+
+def test_fleet_exact_with_fractional_quantities_and_large_values():
+    market = MarketProvider()
+    market._prices["INFY"] = Decimal("1650.005")
+    p = Portfolio(None, market)
+    p.wallet.credit(Decimal("10") ** 15)
+    p.buy("INFY", Decimal("12.345"))
+    p.buy("RELIANCE", Decimal("100000000000"))
+
+    fleet = Fleet([p], market)
+    assert fleet.total_values()[0] == int(p.total_value() * 100)
+    assert fleet.health_signals(Decimal("0.2"), Decimal("0.9")) == [
+        p.health_signals(Decimal("0.2"), Decimal("0.9"))
+    ]
+
+def test_fleet_rebalance_matches_per_portfolio_plans():
+    market = MarketProvider()
+    portfolios = _random_fleet(market, 100, seed=3)
+    targets = {"RELIANCE": Decimal("0.35"), "TCS": Decimal("0.20"), "INFY": Decimal("0.30")}
+
+    plans = Fleet(portfolios, market).rebalance(targets, lot_size=Decimal("2"))
+    assert plans == [p.rebalance(targets, lot_size=Decimal("2")) for p in portfolios]
+    for p, plan in zip(portfolios, plans):
+        for order in plan:
+            (p.sell if order.side == "SELL" else p.buy)(order.symbol, order.quantity)
@@ -2,6 +2,8 @@ import pytest
 from decimal import Decimal
 from quantnest.domain.portfolio import Portfolio
 from quantnest.domain.market import MarketProvider, UnknownSymbolError
+from quantnest.domain.wallet import InsufficientFundsError
+from quantnest.infra.storage import load_trades
 
 def test_portfolio_buy_sell_full_cycle():
     """Complete trading cycle works."""
@@ -49,3 +51,39 @@ def test_portfolio_negative_quantity():
         portfolio.buy("INFY", Decimal("0"))
     with pytest.raises(ValueError, match="positive"):
         portfolio.sell("INFY", Decimal("-1"))
+
+def test_positions_survive_restart():
+    """Positions are replayed from the trade journal, like the wallet."""
+    market = MarketProvider()
+    p1 = Portfolio("persist-user", market)
+    p1.wallet.credit(Decimal("100000"))
+    p1.buy("RELIANCE", Decimal("10"), transaction_id="b1")
+    p1.sell("RELIANCE", Decimal("4"), transaction_id="s1")
+
+    p2 = Portfolio("persist-user", market)
+    assert p2.positions == {"RELIANCE": Decimal("6")}
+    assert p2.wallet.balance == Decimal("85000")
+    assert len(p2.trades) == 2
+
+def test_trade_retry_is_idempotent_and_failed_trades_do_not_replay():
+    market = MarketProvider()
+    p1 = Portfolio("retry-user", market)
+    p1.wallet.credit(Decimal("10000"))
+    p1.buy("INFY", Decimal("2"), transaction_id="b1")
+    p1.buy("INFY", Decimal("2"), transaction_id="b1")  # retry → no double position
+    with pytest.raises(InsufficientFundsError):
+        p1.buy("TCS", Decimal("5"), transaction_id="b2")  # refused before journaling
+
+    p2 = Portfolio("retry-user", market)
+    assert p2.positions == {"INFY": Decimal("2")}
+    assert p2.wallet.balance == Decimal("6700")
+    assert [t.transaction_id for t in load_trades("retry-user")] == ["b1"]
+
+def test_trade_rejects_transaction_id_used_by_wallet():
+    """A --tx matching a credit would be skipped by the wallet as a retry."""
+    p = Portfolio("tx-user", MarketProvider())
+    p.wallet.credit(Decimal("10000"), transaction_id="t1")
+    with pytest.raises(ValueError, match="already used"):
+        p.buy("INFY", Decimal("1"), transaction_id="t1")
+    assert p.positions == {}
+    assert load_trades("tx-user") == []
@@ -0,0 +1,86 @@
+import pytest
+from decimal import Decimal
+from quantnest.domain.portfolio import Portfolio
+from quantnest.domain.market import MarketProvider
+
+TARGETS = {"RELIANCE": Decimal("0.30"), "TCS": Decimal("0.30"), "INFY": Decimal("0.25")}
+
+def _execute(portfolio, plan):
+    for order in plan:
+        if order.side == "SELL":
+            portfolio.sell(order.symbol, order.quantity)
+        else:
+            portfolio.buy(order.symbol, order.quantity)
+
+def test_rebalance_fixes_concentration_sells_first():
+    market = MarketProvider()
+    p = Portfolio("R1", market)
+    p.wallet.credit(Decimal("100000"))
+    p.buy("RELIANCE", Decimal("30"))  # 75% RELIANCE
+    assert p.health_signals()
+
+    plan = p.rebalance(TARGETS)
+    assert [o.side for o in plan] == ["SELL", "BUY", "BUY"]
+    assert plan[0].symbol == "RELIANCE" and plan[0].quantity == Decimal("18")
+
+    _execute(p, plan)
+    assert p.health_signals() == []
+    assert p.rebalance(TARGETS) == []  # already within tolerance → no orders
+
+def test_rebalance_skips_symbols_within_tolerance():
+    market = MarketProvider()
+    p = Portfolio("R2", market)
+    p.wallet.credit(Decimal("100000"))
+    p.buy("RELIANCE", Decimal("12"))  # 30%
+    p.buy("TCS", Decimal("5"))        # 19%
+
+    plan = p.rebalance(TARGETS, tolerance=Decimal("0.02"))
+    assert {o.symbol for o in plan} == {"TCS", "INFY"}
+
+def test_rebalance_respects_cash_lots_and_no_shorting():
+    market = MarketProvider()
+    p = Portfolio("R3", market)
+    p.wallet.credit(Decimal("50000"))
+    p.buy("INFY", Decimal("7"))
+
+    # Everything into TCS in lots of 5: 3 lots wanted, only 2 affordable after selling INFY
+    plan = p.rebalance({"TCS": Decimal("1")}, lot_size=Decimal("5"))
+    assert plan[0].side == "SELL" and plan[0].quantity == Decimal("5")  # 7 held → 1 whole lot
+    assert plan[1].side == "BUY" and plan[1].quantity == Decimal("10")
+    _execute(p, plan)  # never raises InsufficientFundsError / oversell
+    assert p.wallet.balance >= 0
+
+def test_rebalance_validates_request():
+    market = MarketProvider()
+    p = Portfolio("R4", market)
+    with pytest.raises(ValueError, match="sum"):
+        p.rebalance({"TCS": Decimal("0.7"), "INFY": Decimal("0.4")})
+    with pytest.raises(ValueError, match="negative"):
+        p.rebalance({"TCS": Decimal("-0.1")})
+    with pytest.raises(ValueError, match="Lot size"):
+        p.rebalance({"TCS": Decimal("0.5")}, lot_size=Decimal("0"))
+
+def test_rebalance_leaves_within_tolerance_symbols_alone():
+    market = MarketProvider()
+    market._prices.update({"A": Decimal("100.00"), "B": Decimal("100.00")})
+    p = Portfolio("R5", market)
+    p.wallet.credit(Decimal("20000"))
+    p.buy("A", Decimal("101"))  # 50.5%, target 50% → within 1%
+    p.buy("B", Decimal("96"))   # 48%, target 40%; cash 1.5%, target 10%
+
+    plan = p.rebalance({"A": Decimal("0.50"), "B": Decimal("0.40")})
+    assert [(o.side, o.symbol, o.quantity) for o in plan] == [("SELL", "B", Decimal("16"))]
+
+def test_rebalance_spends_cash_stranded_by_lot_rounding():
+    market = MarketProvider()
+    market._prices.update({s: Decimal("100.00") for s in "ABC"})
+    p = Portfolio("R6", market)
+    p.wallet.credit(Decimal("5000"))
+
+    targets = {"A": Decimal("0.34"), "B": Decimal("0.33"), "C": Decimal("0.33")}
+    plan = p.rebalance(targets, lot_size=Decimal("17"))  # 3 lots wanted, 2 affordable
+    assert [(o.side, o.symbol, o.quantity) for o in plan] == [
+        ("BUY", "A", Decimal("17")), ("BUY", "B", Decimal("17")),
+    ]
+    _execute(p, plan)
+    assert p.wallet.balance == Decimal("1600")
@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from quantnest.infra.bars import Bar, BarStore, import_csv
+from quantnest.domain.market import MarketProvider, NoPriceError, UnknownSymbolError
+from quantnest.domain.portfolio import Portfolio
+from quantnest.domain.events import FundsCredited, FundsDebited
+from quantnest.domain.trade import Trade
+from quantnest.infra.storage import append_event, append_trade
+from quantnest.app.fleet import Fleet
+
+def _bar(day, close):
+    c = Decimal(close)
+    return Bar(datetime(2024, 1, day, 15, 30), c, c, c, c, 100)
+
+def test_append_and_point_in_time_lookup():
+    store = BarStore()
+    store.append("reliance", [_bar(1, "2400.00"), _bar(2, "2450.50"), _bar(5, "2500.00")])
+
+    assert store.symbols == ["RELIANCE"]
+    assert store.close_at("RELIANCE", datetime(2024, 1, 2, 15, 30)) == Decimal("2450.50")
+    assert store.close_at("RELIANCE", datetime(2024, 1, 4)) == Decimal("2450.50")  # last bar before
+    assert store.close_at("RELIANCE", datetime(2023, 12, 31)) is None
+
+    store.append("RELIANCE", [_bar(6, "2525.25")])
+    assert len(store.columns("RELIANCE")["ts"]) == 4
+    with pytest.raises(ValueError, match="increasing"):
+        store.append("RELIANCE", [_bar(3, "1.00")])
+
+def test_store_reopens_from_disk():
+    BarStore().append("TCS", [_bar(1, "3800.00")])
+    assert BarStore().close_at("TCS", datetime(2024, 2, 1)) == Decimal("3800.00")
+
+def test_import_csv_any_order(tmp_path):
+    path = tmp_path / "bars.csv"
+    path.write_text(
+        "timestamp,open,high,low,close,volume,symbol\n"
+        "2024-01-02T09:15:00,1,2,1,1655.5,10,INFY\n"
+        "2024-01-01T09:15:00,1,2,1,1650.25,10,INFY\n"
+        "1704101700,1,2,1,1550,10,HDFCBANK\n"
+    )
+    store = BarStore()
+    assert import_csv(store, path) == {"INFY": 2, "HDFCBANK": 1}
+    assert store.close_at("INFY", datetime(2024, 1, 1, 12)) == Decimal("1650.25")
+    assert store.close_at("HDFCBANK", datetime(2024, 1, 1, 12)) == Decimal("1550")
+
+@pytest.mark.parametrize("bad_row", [
+    "2024-01-01T09:15:00,1,2,1,1650.25,10,TCS",     # duplicate timestamp
+    "2024-01-03T09:15:00,1,2,1,1650.12345,10,TCS",  # too many decimals
+    "2024-01-03T09:15:00,1,2,1,1650,10.5,TCS",      # fractional volume
+])
+def test_import_csv_is_all_or_nothing(tmp_path, bad_row):
+    path = tmp_path / "bars.csv"
+    path.write_text(
+        "timestamp,open,high,low,close,volume,symbol\n"
+        "2024-01-01T09:15:00,1,2,1,1550,10,HDFCBANK\n"
+        "2024-01-01T09:15:00,1,2,1,3800,10,TCS\n"
+        f"{bad_row}\n"
+    )
+    store = BarStore()
+    with pytest.raises(ValueError):
+        import_csv(store, path)
+    assert store.symbols == []
+    assert BarStore().symbols == []
+
+def _history(wallet_id):
+    """Ledger written on past dates: fund Jan 1, buy 10 @2000 Jan 1, 10 @3000 Jan 2."""
+    append_event(FundsCredited(amount=Decimal("100000"), transaction_id="c1",
+                               timestamp=datetime(2024, 1, 1, 9)), wallet_id)
+    for tx, day, price in (("b1", 1, "2000.00"), ("b2", 2, "3000.00")):
+        when = datetime(2024, 1, day, 10)
+        trade = Trade("RELIANCE", "BUY", Decimal("10"), Decimal(price), when, tx)
+        append_trade(trade, wallet_id)
+        append_event(FundsDebited(amount=trade.total_value, transaction_id=tx,
+                                  timestamp=when), wallet_id)
+
+def test_market_and_portfolio_value_as_of_past():
+    store = BarStore()
+    store.append("RELIANCE", [_bar(1, "2000.00"), _bar(2, "3000.00")])
+    market = MarketProvider(bars=store)
+    _history("H1")
+    p = Portfolio("H1", market)
+
+    assert p.total_value() == Decimal("100000.00")  # 50k cash + 20 @ 2500 today
+    assert p.total_value(at=datetime(2023, 12, 31)) == Decimal("0.00")
+    assert p.total_value(at=datetime(2024, 1, 1, 9, 30)) == Decimal("100000.00")
+    assert p.positions_at(datetime(2024, 1, 1, 18)) == {"RELIANCE": Decimal("10")}
+    assert p.cash(at=datetime(2024, 1, 1, 18)) == Decimal("80000.00")
+    assert p.total_value(at=datetime(2024, 1, 1, 18)) == Decimal("100000.00")
+    assert p.total_value(at=datetime(2024, 1, 3)) == Decimal("110000.00")
+
+    fleet = Fleet([p], market, at=datetime(2024, 1, 3))
+    assert fleet.total_values()[0] == 11000000
+    with pytest.raises(ValueError, match="point-in-time"):
+        fleet.rebalance({"RELIANCE": Decimal("0.5")})
+
+    with pytest.raises(NoPriceError):
+        market.get_price("RELIANCE", at=datetime(2023, 1, 1))
+    with pytest.raises(UnknownSymbolError):
+        market.get_price("TCS", at=datetime(2024, 1, 1))
+
+@pytest.mark.parametrize("text, message", [
+    ("open,high,low,close,symbol\n1,2,1,1,TCS\n", "missing column"),
+    ("timestamp,open,high,low,close,symbol\n2024-01-01,1,2\n", ":2: missing value"),
+    ("timestamp,open,high,low,close,symbol\nyesterday,1,2,1,1,TCS\n", ":2:"),
+    ("timestamp,open,high,low,close,volume,symbol\n2024-01-01,1,2,1,1,1e30,TCS\n", "TCS"),
+    ("timestamp,open,high,low,close,symbol\n2024-01-01,1,2,1,1e30,TCS\n", "TCS"),
+])
+def test_import_csv_reports_bad_input_as_value_error(tmp_path, text, message):
+    path = tmp_path / "bars.csv"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        import_csv(BarStore(), path)
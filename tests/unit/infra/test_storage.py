@@ -0,0 +1,36 @@
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from quantnest.domain.events import FundsCredited
+from quantnest.infra import storage
+from quantnest.infra.storage import (
+    append_event, compact_events, get_event_file, load_events,
+)
+
+def _credit(n):
+    return FundsCredited(amount=Decimal(n), transaction_id=f"c{n}",
+                         timestamp=datetime(2024, 1, n))
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_append_matches_full_rewrite_without_rereading(monkeypatch, compact):
+    append_event(_credit(1), "S1")
+    if compact:
+        compact_events("S1")
+    with monkeypatch.context() as m:
+        m.setattr(storage, "load_events", None)  # appends must not re-read
+        append_event(_credit(2), "S1")
+        append_event(_credit(3), "S1")
+
+    style = storage.COMPACT if compact else {"indent": 2}
+    text = get_event_file("S1").read_text()
+    assert text == json.dumps(json.loads(text), **style)  # same bytes as a rewrite
+    assert [e.amount for e in load_events("S1")] == [Decimal(n) for n in (1, 2, 3)]
+
+@pytest.mark.parametrize("existing", ["", "[]", "[\n]\n", "not json"])
+def test_append_to_empty_or_unreadable_file(existing):
+    path = get_event_file("S2")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(existing)
+    append_event(_credit(1), "S2")
+    assert [e.transaction_id for e in load_events("S2")] == ["c1"]
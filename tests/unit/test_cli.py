@@ -0,0 +1,119 @@
+import pytest
+import threading
+from pathlib import Path
+from decimal import Decimal
+from quantnest.cli import Session, main, make_server
+from quantnest.domain.wallet import Wallet
+from quantnest.infra.storage import get_event_file, pop_writes
+
+def test_cold_commands_use_the_ledger(capsys):
+    assert main(["--no-daemon", "credit", "cli-1", "1000", "--tx", "t1"]) == 0
+    assert main(["--no-daemon", "credit", "cli-1", "1000", "--tx", "t1"]) == 0  # idempotent
+    assert main(["--no-daemon", "debit", "cli-1", "250.50"]) == 0
+    assert main(["--no-daemon", "balance", "cli-1"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == "₹749.50"
+
+    assert main(["--no-daemon", "debit", "cli-1", "5000"]) == 1
+    assert "Cannot debit" in capsys.readouterr().err
+    assert Wallet("cli-1").balance == Decimal("749.50")
+
+def test_cold_trades_persist_between_invocations(capsys):
+    assert main(["--no-daemon", "credit", "cli-4", "100000"]) == 0
+    assert main(["--no-daemon", "buy", "cli-4", "RELIANCE", "10"]) == 0
+    assert main(["--no-daemon", "sell", "cli-4", "RELIANCE", "10"]) == 0
+    assert main(["--no-daemon", "balance", "cli-4"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == "₹100,000.00"
+
+def test_compact_keeps_events(capsys):
+    main(["--no-daemon", "credit", "cli-2", "100"])
+    before = get_event_file("cli-2").read_text()
+    assert main(["--no-daemon", "compact", "cli-2"]) == 0
+    assert len(get_event_file("cli-2").read_text()) < len(before)
+
+    main(["--no-daemon", "credit", "cli-2", "50"])  # appends stay compact
+    assert "\n" not in get_event_file("cli-2").read_text()
+    main(["--no-daemon", "replay", "cli-2"])
+    assert "Replayed 2 events → ₹150.00" in capsys.readouterr().out
+
+@pytest.fixture
+def daemon():
+    """A daemon bound to q.sock in the test's temp dir - shut down afterwards."""
+    server = make_server("q.sock")
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield ["--socket", "q.sock"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    assert not Path("q.sock").exists()
+
+def test_daemon_keeps_portfolio_warm(capsys, daemon):
+    assert main(daemon + ["credit", "cli-3", "100000"]) == 0
+    assert main(daemon + ["buy", "cli-3", "RELIANCE", "30"]) == 0
+    assert main(daemon + ["sell", "cli-3", "reliance", "10"]) == 0
+    assert main(daemon + ["report", "cli-3"]) == 0
+    out = capsys.readouterr().out
+    assert "RELIANCE" in out and "High concentration" in out
+    assert main(daemon + ["sell", "cli-3", "TCS", "1"]) == 1
+    assert Wallet("cli-3").balance == Decimal("50000")
+
+def test_daemon_sees_writes_made_without_it(capsys, daemon):
+    assert main(daemon + ["credit", "cli-6", "100"]) == 0
+    assert main(["--no-daemon", "credit", "cli-6", "50"]) == 0
+    assert main(daemon + ["balance", "cli-6"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == "₹150.00"
+    assert main(daemon + ["debit", "cli-6", "120"]) == 0
+
+    assert main(["--no-daemon", "buy", "cli-6", "INFY", "0.01"]) == 0
+    assert main(daemon + ["sell", "cli-6", "INFY", "0.01"]) == 0
+
+@pytest.mark.parametrize("amount", ["Infinity", "inf", "NaN", "sNaN", "abc"])
+def test_non_finite_amounts_are_rejected(capsys, amount):
+    with pytest.raises(SystemExit) as exc:
+        main(["--no-daemon", "credit", "cli-5", amount])
+    assert exc.value.code == 2
+    assert "number" in capsys.readouterr().err
+    assert not get_event_file("cli-5").exists()
+
+def test_daemon_survives_bad_requests(daemon):
+    import json, socket
+
+    def send(payload):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect("q.sock")
+            sock.sendall(payload + b"\n")
+            return json.loads(sock.makefile("rb").readline())
+
+    reply = send(b'{"argv": ["bogus"]}')
+    assert reply["code"] == 2 and "invalid choice" in reply["err"]
+    assert send(b'{"argv": ["daemon"]}')["code"] == 2
+    assert send(b"not json")["code"] == 1
+    assert send(b'{"argv": ["balance", "cli-7"]}') == {"code": 0, "out": "₹0.00\n", "err": ""}
+
+def test_daemon_reloads_after_a_write_racing_its_own():
+    session = Session(warm=True)
+    wallet = session.wallet("cli-8")  # command starts with a fresh cache
+    Wallet("cli-8").credit(Decimal("50"), transaction_id="outside")
+    pop_writes(get_event_file("cli-8"))  # as if another process had written
+    wallet.credit(Decimal("100"))
+    session.saved("cli-8")
+    assert session.wallet("cli-8").balance == Decimal("150")
+
+    cached = session.wallet("cli-8")
+    cached.credit(Decimal("1"))  # only our own write - cache stays
+    session.saved("cli-8")
+    assert session.wallet("cli-8") is cached
+
+def test_second_daemon_does_not_take_over(capsys, daemon):
+    assert main(daemon + ["daemon"]) == 1
+    assert "already listening" in capsys.readouterr().err
+    assert main(daemon + ["balance", "cli-9"]) == 0  # first daemon still serves
+
+def test_daemon_replaces_a_stale_socket():
+    make_server("q.sock").socket.close()  # died without cleaning up
+    assert Path("q.sock").exists()
+    server = make_server("q.sock")
+    server.server_close()
+    assert not Path("q.sock").exists()